@@ -1,8 +1,46 @@
 import os
 import re
 from pathlib import Path
-from typing import Dict, Set, List, Optional
-from collections import defaultdict
+from typing import Dict, Iterator, Set, List, Optional, TextIO, Tuple
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+
+# Fixed text for the generated headers
+INCLUDES_PRELUDE = (
+    '#pragma once\n\n'
+    '// Core includes\n'
+    '#include <Unreal/UObject.hpp>\n'
+    '#include <Unreal/AActor.hpp>\n'
+    '#include <Unreal/TArray.hpp>\n'
+    '#include <Unreal/FString.hpp>\n'
+    '#include "StructUtil.hpp"\n\n'
+    '// Game modules\n'
+)
+MODULE_PRELUDE = (
+    '#pragma once\n'
+    '#include "GameIncludes.hpp"\n\n'
+    'namespace game {\n\n'
+)
+MODULE_EPILOGUE = '} // namespace game\n'
+
+# Field types that never name a dependency
+PRIMITIVE_TYPES = frozenset({'bool', 'float', 'int32_t', 'uint32_t'})
+# Bare type name: drops the RC::Unreal:: namespace and stops at template arguments or pointers
+BARE_TYPE_PATTERN = re.compile(r'\s*(?:RC::Unreal::)?([^<*&\s]*)')
+
+# (classes, structs, enums, dependencies) found in one file
+FileDeclarations = Tuple[Dict[str, str], Dict[str, str], Dict[str, str], Dict[str, Set[str]]]
+
+def iter_hpp_files(root: str) -> Iterator[str]:
+    """Recursively yield paths of .hpp files under root"""
+    stack = [root]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.name.endswith('.hpp'):
+                    yield entry.path
 
 class HeaderConsolidator:
     def __init__(self):
@@ -16,6 +54,12 @@ class HeaderConsolidator:
             'MRMesh', 'GeometryCollectionEngine', 'ChaosSolverEngine', 'DatasmithContent',
             'DatasmithCore', 'GeometryCollectionSimulationCore'
         }
+        # Single-pass matcher for all engine module names (longest first)
+        self.engine_modules_pattern = re.compile('|'.join(
+            re.escape(module) for module in sorted(self.engine_modules, key=len, reverse=True)
+        ))
+        # Same matcher over raw file bytes, so engine files are rejected before decoding
+        self.engine_modules_bytes_pattern = re.compile(self.engine_modules_pattern.pattern.encode('ascii'))
         
         # Module categorization
         self.module_categories = {
@@ -26,6 +70,11 @@ class HeaderConsolidator:
             'Audio': ['Sound', 'Music', 'Voice'],
             'Physics': ['Physics', 'Collision'],
         }
+        # Case-insensitive keyword matchers, one per category
+        self.category_patterns = {
+            category: re.compile('|'.join(map(re.escape, keywords)), re.IGNORECASE)
+            for category, keywords in self.module_categories.items()
+        }
 
         # Content patterns
         self.class_pattern = re.compile(r'class\s+(\w+)(?:\s*:\s*public\s+(\w+))?')
@@ -44,7 +93,7 @@ class HeaderConsolidator:
         base_name = Path(filename).stem
         
         # Skip known engine modules
-        if any(module in base_name for module in self.engine_modules):
+        if self.engine_modules_pattern.search(base_name) is not None:
             return True
             
         # Skip generated engine headers
@@ -55,8 +104,8 @@ class HeaderConsolidator:
 
     def determine_module(self, content: str) -> str:
         """Determine appropriate module based on content"""
-        for category, keywords in self.module_categories.items():
-            if any(keyword.lower() in content.lower() for keyword in keywords):
+        for category, pattern in self.category_patterns.items():
+            if pattern.search(content):
                 return category
         return 'Game'  # Default module
 
@@ -71,27 +120,26 @@ class HeaderConsolidator:
                 
         # Find field types
         for match in self.field_pattern.finditer(content):
-            type_name = match.group(2).strip()
-            # Remove RC::Unreal:: namespace
-            type_name = type_name.replace('RC::Unreal::', '')
-            # Remove template parameters
-            type_name = re.sub(r'<.*>', '', type_name)
-            # Remove pointer
-            type_name = type_name.rstrip('*')
-            if type_name not in {'bool', 'float', 'int32_t', 'uint32_t'}:
+            type_name = BARE_TYPE_PATTERN.match(match.group(2)).group(1)
+            if type_name not in PRIMITIVE_TYPES:
                 deps.add(type_name)
                 
         return deps
 
-    def process_file(self, filepath: str) -> Optional[str]:
-        """Process a single file and categorize its content"""
-        with open(filepath, 'r', encoding='utf-8') as f:
-            content = f.read()
+    def process_file(self, filepath: str) -> Optional[FileDeclarations]:
+        """Parse a single file into its declarations without touching shared state"""
+        with open(filepath, 'rb') as f:
+            raw = f.read()
 
         # Skip if content contains engine types
-        if any(module in content for module in self.engine_modules):
+        if self.engine_modules_bytes_pattern.search(raw) is not None:
             return None
 
+        # Decode only files that are kept, normalizing newlines like text mode would
+        content = raw.decode('utf-8')
+        if b'\r' in raw:
+            content = content.replace('\r\n', '\n').replace('\r', '\n')
+
         def clean_identifier(name: str) -> str:
             """Clean and validate C++ identifiers"""
             if not name:
@@ -101,6 +149,11 @@ class HeaderConsolidator:
                 name = 'C' + name
             return name
 
+        classes: Dict[str, str] = {}
+        structs: Dict[str, str] = {}
+        enums: Dict[str, str] = {}
+        dependencies: Dict[str, Set[str]] = {}
+
         # Find all declarations with cleaned names
         for match in self.class_pattern.finditer(content):
             class_name = clean_identifier(match.group(1))
@@ -108,135 +161,171 @@ class HeaderConsolidator:
             if class_content:
                 # Replace the original class name with the cleaned version
                 class_content = class_content.replace(match.group(1), class_name)
-                self.classes[class_name] = class_content
-                self.dependencies[class_name] = self.extract_dependencies(class_content)
+                classes[class_name] = class_content
+                dependencies[class_name] = self.extract_dependencies(class_content)
 
         for match in self.struct_pattern.finditer(content):
             struct_name = match.group(1)
             if struct_name.startswith('Fstruct_'):
                 struct_content = self.extract_block(content, match.start())
                 if struct_content:
-                    self.structs[struct_name] = struct_content
+                    structs[struct_name] = struct_content
 
         for match in self.enum_pattern.finditer(content):
             enum_name = match.group(1)
             enum_content = self.extract_block(content, match.start())
             if enum_content:
-                self.enums[enum_name] = enum_content
+                enums[enum_name] = enum_content
+
+        return classes, structs, enums, dependencies
 
-        return self.determine_module(content)
+    def merge_declarations(self, declarations: FileDeclarations):
+        """Merge the declarations parsed from one file into the consolidated set"""
+        classes, structs, enums, dependencies = declarations
+        self.classes.update(classes)
+        self.structs.update(structs)
+        self.enums.update(enums)
+        self.dependencies.update(dependencies)
 
     def extract_block(self, content: str, start_pos: int) -> Optional[str]:
         """Extract a complete code block starting from position"""
-        brace_count = 0
-        found_start = False
-        block_lines = []
-        
-        for line in content[start_pos:].split('\n'):
-            if '{' in line:
-                found_start = True
-                brace_count += line.count('{')
-            if '}' in line:
-                brace_count -= line.count('}')
-            
-            if found_start:
-                block_lines.append(line)
-                
-            if found_start and brace_count == 0:
-                return '\n'.join(block_lines)
-                
-        return None
+        open_pos = content.find('{', start_pos)
+        if open_pos == -1:
+            return None
 
-    def sort_declarations(self) -> Dict[str, List[str]]:
-        """Sort declarations based on dependencies"""
-        ordered_content: Dict[str, List[str]] = defaultdict(list)
-        
+        # Block starts on the line holding the opening brace
+        line_start = content.rfind('\n', start_pos, open_pos)
+        block_start = start_pos if line_start == -1 else line_start + 1
+
+        # Walk brace to brace until the opening brace is balanced
+        brace_count = 1
+        pos = open_pos + 1
+        next_open = content.find('{', pos)
+        while brace_count:
+            next_close = content.find('}', pos)
+            if next_close == -1:
+                return None
+            if next_open != -1 and next_open < next_close:
+                brace_count += 1
+                pos = next_open + 1
+                next_open = content.find('{', pos)
+            else:
+                brace_count -= 1
+                pos = next_close + 1
+
+        # Include the rest of the closing line (e.g. '};')
+        block_end = content.find('\n', pos)
+        if block_end == -1:
+            block_end = len(content)
+        return content[block_start:block_end]
+
+    def sort_declarations(self) -> Iterator[Tuple[str, str]]:
+        """Yield (module, declaration) pairs in dependency order"""
         # Add enums first
         for enum_name, enum_content in sorted(self.enums.items()):
-            ordered_content['Enums'].append(enum_content)
+            yield 'Enums', enum_content
             
         # Add structs second
         for struct_name, struct_content in sorted(self.structs.items()):
-            ordered_content['Structs'].append(struct_content)
+            yield 'Structs', struct_content
             
-        # Add classes in dependency order
-        processed = set()
-        while self.classes:
-            for class_name, deps in self.dependencies.items():
-                if class_name not in self.classes:
-                    continue
-                if deps <= processed:
-                    module = self.determine_module(self.classes[class_name])
-                    ordered_content[module].append(self.classes[class_name])
-                    processed.add(class_name)
-                    del self.classes[class_name]
-                    break
-            else:
-                # Handle circular dependencies by adding remaining classes
-                for class_name, content in sorted(self.classes.items()):
-                    module = self.determine_module(content)
-                    ordered_content[module].append(content)
-                break
-                
-        return ordered_content
+        # Categorize each class body once
+        class_module: Dict[str, str] = {
+            name: self.determine_module(content) for name, content in self.classes.items()
+        }
+
+        # Add classes in dependency order (Kahn's algorithm). Only dependencies on
+        # classes being consolidated count; external types are already available.
+        dependents: Dict[str, List[str]] = defaultdict(list)
+        in_degree: Dict[str, int] = {}
+        for class_name in self.classes:
+            deps = self.dependencies.get(class_name, set()) & self.classes.keys()
+            deps.discard(class_name)
+            in_degree[class_name] = len(deps)
+            for dep in deps:
+                dependents[dep].append(class_name)
+
+        ready = deque(name for name, degree in in_degree.items() if degree == 0)
+        while ready:
+            class_name = ready.popleft()
+            # Classes are dropped as they are emitted to keep peak memory down
+            yield class_module[class_name], self.classes.pop(class_name)
+            for dependent in dependents[class_name]:
+                in_degree[dependent] -= 1
+                if in_degree[dependent] == 0:
+                    ready.append(dependent)
+
+        # Handle circular dependencies by adding remaining classes
+        for class_name in sorted(self.classes):
+            yield class_module[class_name], self.classes.pop(class_name)
+
+    def module_filename(self, module: str) -> str:
+        """Output header name for a module"""
+        return 'GameEnums.hpp' if module == 'Enums' else \
+               'GameStructs.hpp' if module == 'Structs' else \
+               f'Game{module}.hpp'
 
-    def consolidate_headers(self, input_dir: str, output_dir: str):
+    def collect_declarations(self, hpp_files: List[str], max_workers: Optional[int] = None):
+        """Parse files in worker processes and merge each result as it arrives"""
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            # map yields in file order, so duplicate names resolve the same way on every
+            # run, and no per-file result outlives its merge into the consolidated set
+            results = executor.map(_process_in_worker, hpp_files)
+            for done, (hpp_file, declarations) in enumerate(zip(hpp_files, results), 1):
+                if declarations:
+                    self.merge_declarations(declarations)
+                print(f"Processed ({done}/{len(hpp_files)}): {hpp_file}")
+
+    def consolidate_headers(self, input_dir: str, output_dir: str, max_workers: Optional[int] = None):
         """Main consolidation process"""
-        # Process all input files
-        input_path = Path(input_dir)
-        for hpp_file in input_path.glob('**/*.hpp'):
-            if self.should_skip_file(str(hpp_file)):
+        hpp_files = []
+        for hpp_file in iter_hpp_files(input_dir):
+            if self.should_skip_file(hpp_file):
                 print(f"Skipping engine file: {hpp_file}")
                 continue
-                
-            print(f"Processing: {hpp_file}")
-            self.process_file(str(hpp_file))
+            hpp_files.append(hpp_file)
+
+        self.collect_declarations(hpp_files, max_workers)
             
         # Create output directory
         os.makedirs(output_dir, exist_ok=True)
         
-        # Sort and organize content
-        ordered_content = self.sort_declarations()
+        # Stream declarations into their module files as they are ordered
+        output_files: Dict[str, TextIO] = {}
+        try:
+            for module, content in self.sort_declarations():
+                f = output_files.get(module)
+                if f is None:
+                    output_path = os.path.join(output_dir, self.module_filename(module))
+                    f = output_files[module] = open(output_path, 'w', encoding='utf-8')
+                    f.write(MODULE_PRELUDE)
+                f.write(f'{content}\n\n')
+        finally:
+            for f in output_files.values():
+                f.write(MODULE_EPILOGUE)
+                f.close()
+
+        for module in output_files:
+            print(f"Created {self.module_filename(module)}")
         
         # Write base includes file
         includes_path = os.path.join(output_dir, 'GameIncludes.hpp')
+        chunks = [INCLUDES_PRELUDE]
+        # Add module includes
+        for module in sorted(output_files.keys()):
+            if module not in {'Enums', 'Structs'}:
+                chunks.append(f'#include "Game{module}.hpp"\n')
         with open(includes_path, 'w', encoding='utf-8') as f:
-            f.write('#pragma once\n\n')
-            f.write('// Core includes\n')
-            f.write('#include <Unreal/UObject.hpp>\n')
-            f.write('#include <Unreal/AActor.hpp>\n')
-            f.write('#include <Unreal/TArray.hpp>\n')
-            f.write('#include <Unreal/FString.hpp>\n')
-            f.write('#include "StructUtil.hpp"\n\n')
-            
-            # Add module includes
-            f.write('// Game modules\n')
-            for module in sorted(ordered_content.keys()):
-                if module not in {'Enums', 'Structs'}:
-                    f.write(f'#include "Game{module}.hpp"\n')
-        
-        # Write content files
-        for module, content_list in ordered_content.items():
-            if not content_list:
-                continue
-                
-            filename = 'GameEnums.hpp' if module == 'Enums' else \
-                      'GameStructs.hpp' if module == 'Structs' else \
-                      f'Game{module}.hpp'
-                      
-            output_path = os.path.join(output_dir, filename)
-            
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write('#pragma once\n')
-                f.write('#include "GameIncludes.hpp"\n\n')
-                f.write('namespace game {\n\n')
-                
-                for content in content_list:
-                    f.write(f'{content}\n\n')
-                    
-                f.write('} // namespace game\n')
-                
-            print(f"Created {filename}")
+            f.write(''.join(chunks))
+
+# Per-process consolidator used by the worker pool, created on the first task
+_worker_consolidator: Optional[HeaderConsolidator] = None
+
+def _process_in_worker(filepath: str) -> Optional[FileDeclarations]:
+    global _worker_consolidator
+    if _worker_consolidator is None:
+        _worker_consolidator = HeaderConsolidator()
+    return _worker_consolidator.process_file(filepath)
 
 def main():
     import argparse
@@ -244,11 +333,17 @@ def main():
     parser = argparse.ArgumentParser(description='Consolidate converted UE4SS headers')
     parser.add_argument('input_dir', help='Directory containing converted headers')
     parser.add_argument('output_dir', help='Directory for consolidated output')
+    parser.add_argument('-j', '--jobs', type=int, default=None,
+                        help='Number of worker processes (default: CPU count)')
     
     args = parser.parse_args()
     
+    if not os.path.isdir(args.input_dir):
+        print(f"Error: Input directory {args.input_dir} not found")
+        return
+    
     consolidator = HeaderConsolidator()
-    consolidator.consolidate_headers(args.input_dir, args.output_dir)
+    consolidator.consolidate_headers(args.input_dir, args.output_dir, max_workers=args.jobs)
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
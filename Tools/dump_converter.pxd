@@ -0,0 +1,27 @@
+# Cython declarations for dump_converter.py (pure Python mode).
+# Only used when the module is compiled, see load_converter_class().
+cimport cython
+
+cdef class HPPConverter:
+    cdef public dict type_mappings
+    cdef public set ignored_types
+    cdef public dict struct_cache
+    cdef dict _type_cache
+    cdef object _ignored_re
+
+    cdef object _wrapper_re
+    cdef object _struct_name_re
+    cdef object _class_decl_re
+    cdef object _parent_re
+
+    @cython.locals(underscore=Py_ssize_t, head=unicode)
+    cpdef str clean_name(self, str name)
+    cpdef object convert_struct_field(self, str line)
+    cpdef object convert_type(self, str ue_type)
+    cpdef object _convert_type(self, str ue_type)
+    cpdef object convert_line_to_field(self, str line)
+
+    @cython.locals(comment=Py_ssize_t, end=Py_ssize_t, offset=unicode, decl=unicode,
+                   type_name=unicode, var_name=unicode, stripped=unicode, core=unicode,
+                   depth=Py_ssize_t)
+    cpdef tuple _parse_field_line(self, str line)
@@ -1,7 +1,32 @@
 import re
 import os
+import sys
+import importlib
+import importlib.machinery
 from pathlib import Path
-from typing import List, Tuple, Dict, Optional, Set
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Iterator, List, Tuple, Dict, Optional, Set
+
+# Characters allowed in a field type besides identifier characters and spaces
+TYPE_PUNCTUATION = frozenset('<>*&:')
+HEX_DIGITS = frozenset('0123456789ABCDEFabcdef')
+# Fixed text written around every converted file
+FILE_PRELUDE = (
+    '#pragma once\n'
+    '#include <Unreal/UObject.hpp>\n'
+    '#include <Unreal/AActor.hpp>\n'
+    '#include <Unreal/TArray.hpp>\n'
+    '#include <Unreal/FString.hpp>\n'
+    '#include "StructUtil.hpp"\n\n'
+    'namespace game {\n\n'
+)
+FILE_EPILOGUE = '} // namespace game\n'
+
+# Core UE4 types that are passed through untouched
+CORE_TYPE_PREFIXES = ('UObject', 'AActor', 'UActorComponent')
+
+# Blueprint variable GUID suffixes are 32 uppercase hex digits
+GUID_DIGITS = frozenset('0123456789ABCDEF')
 
 class HPPConverter:
     def __init__(self):
@@ -42,15 +67,32 @@ class HPPConverter:
             'FVector4',
             'FGuid'
         }
+        # Ignored names also match inside longer types (e.g. TArray<FGuid>, FBoxSphereBounds)
+        self._ignored_re = re.compile('|'.join(map(re.escape, self.ignored_types)))
 
         self.struct_cache: Dict[str, List[str]] = {}
+        # Converted types by source type; filled lazily by convert_type
+        self._type_cache: Dict[str, Optional[str]] = {}
+
+        # Precompiled patterns for the per-line / per-type hot paths
+        # Type wrappers dispatched on the matched group name
+        self._wrapper_re = re.compile(r'class\s+(?P<cls>.*)|TArray<(?P<arr>.+)>|TSubclassOf<(?P<sub>.+)>|TEnumAsByte<(?P<enum>.+)>')
+        self._struct_name_re = re.compile(r'struct\s+(Fstruct_\w+)')
+        self._class_decl_re = re.compile(r'class\s+(\w+)\s*:')
+        self._parent_re = re.compile(r':\s*(?:public\s+)?(\w+)')
 
     def clean_name(self, name: str) -> str:
         """Clean variable names by removing numeric suffixes and GUIDs"""
         # Remove _X_GUID pattern
-        name = re.sub(r'_\d+_[A-F0-9]{32}$', '', name)
+        if len(name) >= 35 and name[-33] == '_' and GUID_DIGITS.issuperset(name[-32:]):
+            head = name[:-33]
+            underscore = head.rfind('_')
+            if underscore != -1 and head[underscore + 1:].isdecimal():
+                name = head[:underscore]
         # Remove numeric suffix
-        name = re.sub(r'_\d+$', '', name)
+        underscore = name.rfind('_')
+        if underscore != -1 and name[underscore + 1:].isdecimal():
+            name = name[:underscore]
         return name
 
     def clean_class_name(self, name: str) -> str:
@@ -59,7 +101,7 @@ class HPPConverter:
             return name
                 
         # Skip core UE4 types
-        if name.startswith(('UObject', 'AActor', 'UActorComponent')):
+        if name.startswith(CORE_TYPE_PREFIXES):
             return name
             
         # Fix invalid C++ identifiers - if starts with number, prefix with 'C'
@@ -108,11 +150,11 @@ class HPPConverter:
     def convert_struct_field(self, line: str) -> Optional[str]:
         """Convert a struct field line to FIELD() format"""
         # Match the field pattern including GUIDs
-        match = re.match(r'\s*([\w<>*:]+(?:\s*[*&])?)\s+(\w+(?:_\d+)?(?:_[A-F0-9]{32})?);?\s*//\s*(0x[0-9A-F]+)', line, re.IGNORECASE)
-        if not match:
+        fields = self._parse_field_line(line)
+        if not fields:
             return None
 
-        type_name, var_name, offset = match.groups()
+        type_name, var_name, offset = fields
         clean_var_name = self.clean_name(var_name)
         converted_type = self.convert_type(type_name)
         
@@ -123,31 +165,49 @@ class HPPConverter:
 
     def convert_type(self, ue_type: str) -> Optional[str]:
         """Convert UE4SS type to appropriate format"""
+        try:
+            return self._type_cache[ue_type]
+        except KeyError:
+            pass
+        converted = self._convert_type(ue_type)
+        self._type_cache[ue_type] = converted
+        return converted
+
+    def _convert_type(self, ue_type: str) -> Optional[str]:
+        """Uncached conversion behind convert_type"""
         # Check if type should be ignored
-        if any(ignored in ue_type for ignored in self.ignored_types):
+        if ue_type in self.ignored_types or self._ignored_re.search(ue_type):
             return None
                 
-        # Remove class prefix if present
-        ue_type = re.sub(r'^class\s+', '', ue_type)
-            
-        # Handle TArray
-        if ue_type.startswith('TArray<'):
-            inner_type = re.search(r'TArray<(.+)>', ue_type).group(1)
-            converted_inner = self.convert_type(inner_type)
-            if converted_inner:
-                return f"RC::Unreal::TArray<{converted_inner}>"
-            return None
+        wrapper = self._wrapper_re.match(ue_type)
+        if wrapper:
+            kind = wrapper.lastgroup
+            inner_type = wrapper.group(kind)
 
-        # Handle TSubclassOf
-        if ue_type.startswith('TSubclassOf<'):
-            inner_type = re.search(r'TSubclassOf<(.+)>', ue_type).group(1)
-            converted_inner = self.convert_type(inner_type)
-            if converted_inner:
-                return f"RC::Unreal::TSubclassOf<{converted_inner}>"
-            return None
+            # Remove class prefix if present
+            if kind == 'cls':
+                return self.convert_type(inner_type)
+
+            # Handle TArray
+            elif kind == 'arr':
+                converted_inner = self.convert_type(inner_type)
+                if converted_inner:
+                    return f"RC::Unreal::TArray<{converted_inner}>"
+                return None
+
+            # Handle TSubclassOf
+            elif kind == 'sub':
+                converted_inner = self.convert_type(inner_type)
+                if converted_inner:
+                    return f"RC::Unreal::TSubclassOf<{converted_inner}>"
+                return None
+
+            # Handle enum types
+            else:
+                return inner_type
                 
         # Don't convert core UE4 types
-        if ue_type.startswith(('UObject', 'AActor', 'UActorComponent')):
+        if ue_type.startswith(CORE_TYPE_PREFIXES):
             return ue_type
                 
         # Check direct mappings for non-core types
@@ -159,11 +219,6 @@ class HPPConverter:
         if base_type in self.type_mappings:
             return f"{self.type_mappings[base_type]}*"
 
-        # Handle enum types
-        if ue_type.startswith('TEnumAsByte<'):
-            enum_type = re.search(r'TEnumAsByte<(.+)>', ue_type).group(1)
-            return enum_type
-
         # Clean up class names
         cleaned_type = self.clean_class_name(ue_type)
         if cleaned_type != ue_type:
@@ -171,28 +226,17 @@ class HPPConverter:
                 
         return ue_type
 
-    def convert_file(self, input_path: str, input_dir: str) -> List[str]:
+    def convert_file(self, input_path: str, input_dir: str) -> str:
         """Convert file content"""
-        output_lines = []
+        output_lines = [FILE_PRELUDE]
         current_class = None
         found_structs: Set[str] = set()
         
-        # Add standard includes
-        output_lines.extend([
-            '#pragma once\n',
-            '#include <Unreal/UObject.hpp>\n',
-            '#include <Unreal/AActor.hpp>\n',
-            '#include <Unreal/TArray.hpp>\n',
-            '#include <Unreal/FString.hpp>\n',
-            '#include "StructUtil.hpp"\n\n',
-            'namespace game {\n\n'
-        ])
-
-        # First pass - collect struct names
         with open(input_path, 'r', encoding='utf-8') as f:
             content = f.read()
-            struct_matches = re.finditer(r'struct\s+(Fstruct_\w+)', content)
-            found_structs.update(match.group(1) for match in struct_matches)
+
+        # First pass - collect struct names
+        found_structs.update(self._struct_name_re.findall(content))
 
         # Process struct definitions
         for struct_name in sorted(found_structs):
@@ -201,16 +245,13 @@ class HPPConverter:
                 output_lines.extend(struct_lines)
 
         # Process main file
-        with open(input_path, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-
-        for line in lines:
-            class_match = re.match(r'class\s+(\w+)\s*:', line)
+        for line in content.splitlines(keepends=True):
+            class_match = self._class_decl_re.match(line)
             if class_match:
                 if current_class:
                     output_lines.append("};\n\n")
                 class_name = self.clean_class_name(class_match.group(1))
-                parent_match = re.search(r':\s*(?:public\s+)?(\w+)', line)
+                parent_match = self._parent_re.search(line)
                 parent_class = self.clean_class_name(parent_match.group(1)) if parent_match else ""
                 parent_class = f" : public {parent_class}" if parent_class else ""
                 output_lines.append(f"class {class_name}{parent_class} {{\npublic:\n")
@@ -225,16 +266,16 @@ class HPPConverter:
         if current_class:
             output_lines.append("};\n\n")
 
-        output_lines.append("} // namespace game\n")
-        return output_lines
+        output_lines.append(FILE_EPILOGUE)
+        return ''.join(output_lines)
 
     def convert_line_to_field(self, line: str) -> Optional[str]:
         """Convert a single line to FIELD() format"""
-        match = re.match(r'\s*([\w<>*:]+(?:\s*[*&])?)\s+(\w+);?\s*//\s*(0x[0-9A-F]+)', line, re.IGNORECASE)
-        if not match:
+        fields = self._parse_field_line(line)
+        if not fields:
             return None
 
-        type_name, var_name, offset = match.groups()
+        type_name, var_name, offset = fields
         converted_type = self.convert_type(type_name)
         
         if not converted_type:
@@ -242,36 +283,157 @@ class HPPConverter:
             
         return f"    FIELD({offset}, {converted_type}, {var_name});\n"
 
-def process_files(input_dir: str, output_dir: str):
+    def _parse_field_line(self, line: str) -> Optional[Tuple[str, str, str]]:
+        """Split a 'TYPE NAME; // 0xOFFSET' line without going through the regex engine"""
+        comment = line.find('//')
+        if comment == -1:
+            return None
+
+        # Offset is the leading hex literal of the comment
+        offset = line[comment + 2:].lstrip()
+        if not offset.startswith(('0x', '0X')):
+            return None
+        end = 2
+        while end < len(offset) and offset[end] in HEX_DIGITS:
+            end += 1
+        if end == 2:
+            return None
+        offset = offset[:end]
+
+        # Declaration is everything before the comment, minus the terminating ';'
+        decl = line[:comment].rstrip()
+        if decl.endswith(';'):
+            decl = decl[:-1]
+        parts = decl.rsplit(None, 1)
+        if len(parts) != 2:
+            return None
+        type_name, var_name = parts
+
+        # Pointer/reference markers written against the name belong to the type
+        stripped = var_name.lstrip('*&')
+        if stripped != var_name:
+            type_name += var_name[:len(var_name) - len(stripped)]
+            var_name = stripped
+
+        if not var_name or var_name[0].isdigit() or not var_name.replace('_', 'a').isalnum():
+            return None
+        type_name = type_name.strip()
+
+        # Spaces are only allowed after a leading 'class' keyword, inside template
+        # arguments and before trailing pointer/reference markers. Commas would split
+        # the FIELD() macro arguments, so templates like TMap are skipped.
+        core = type_name[6:].lstrip() if type_name.startswith('class ') else type_name
+        core = core.rstrip('*&').rstrip()
+        depth = 0
+        for c in core:
+            if c == '<':
+                depth += 1
+            elif c == '>':
+                depth -= 1
+            elif c == ' ':
+                if depth == 0:
+                    return None
+            elif not (c.isalnum() or c == '_' or c in TYPE_PUNCTUATION):
+                return None
+
+        return type_name, var_name, offset
+
+def iter_hpp_files(root: str) -> Iterator[str]:
+    """Recursively yield paths of .hpp files under root"""
+    stack = [root]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.name.endswith('.hpp'):
+                    yield entry.path
+
+# Cython build output, kept next to this checkout so separate checkouts never share a build
+PYXBLD_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.pyxbld')
+
+# Compiled HPPConverter once it has been loaded in this process
+_compiled_converter: Optional[type] = None
+
+def _is_compiled(module) -> bool:
+    return getattr(module, '__file__', '').endswith(tuple(importlib.machinery.EXTENSION_SUFFIXES))
+
+def load_converter_class(use_compiled: bool = True) -> type:
+    """Return a Cython-compiled HPPConverter if Cython is available, else the pure Python one"""
+    global _compiled_converter
+    if not use_compiled:
+        return HPPConverter
+    if _compiled_converter is not None:
+        return _compiled_converter
+
+    loaded = sys.modules.get('dump_converter')
+    if loaded is not None and _is_compiled(loaded):
+        return loaded.HPPConverter
+
+    try:
+        import pyximport
+    except ImportError:
+        return HPPConverter
+
+    # Compile this module (typed via dump_converter.pxd) on first use. When it was
+    # imported normally the pure module is set aside so the import reaches pyximport.
+    sys.modules.pop('dump_converter', None)
+    py_importer, pyx_importer = pyximport.install(pyimport=True, build_dir=PYXBLD_DIR, language_level=3)
+    try:
+        compiled = importlib.import_module('dump_converter')
+    except Exception as e:
+        print(f"Cython build failed, using pure Python converter: {str(e)}")
+        return HPPConverter
+    finally:
+        pyximport.uninstall(py_importer, pyx_importer)
+        if loaded is not None:
+            sys.modules['dump_converter'] = loaded
+
+    _compiled_converter = compiled.HPPConverter
+    return _compiled_converter
+
+# Per-process converter used by the worker pool, created on the first task
+_worker_converter: Optional[HPPConverter] = None
+
+def _convert_in_worker(hpp_file: str, input_dir: str, use_compiled: bool) -> str:
+    global _worker_converter
+    if _worker_converter is None:
+        _worker_converter = load_converter_class(use_compiled)()
+    return _worker_converter.convert_file(hpp_file, input_dir)
+
+def process_files(input_dir: str, output_dir: str, max_workers: Optional[int] = None):
     """Process all .hpp files in input directory"""
-    converter = HPPConverter()
+    # Resolve the converter once; workers reuse the built module or skip a build that failed
+    use_compiled = load_converter_class() is not HPPConverter
     
     os.makedirs(output_dir, exist_ok=True)
     
-    input_path = Path(input_dir)
-    for hpp_file in input_path.glob('**/*.hpp'):
-        # Skip struct definition files, they'll be processed as needed
-        if hpp_file.stem.startswith('struct_'):
-            continue
-            
-        try:
-            rel_path = hpp_file.relative_to(input_path)
-            output_path = Path(output_dir) / rel_path
-            
-            output_path.parent.mkdir(parents=True, exist_ok=True)
-            
-            converted_lines = converter.convert_file(str(hpp_file), str(input_path))
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.writelines(converted_lines)
+    # Skip struct definition files, they'll be processed as needed
+    hpp_files = [hpp_file for hpp_file in iter_hpp_files(input_dir)
+                 if not os.path.basename(hpp_file).startswith('struct_')]
+    
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(_convert_in_worker, hpp_file, input_dir, use_compiled): hpp_file
+                   for hpp_file in hpp_files}
+        for done, future in enumerate(as_completed(futures), 1):
+            hpp_file = futures[future]
+            try:
+                converted = future.result()
                 
-            print(f"Successfully converted {hpp_file} -> {output_path}")
-            
-        except Exception as e:
-            print(f"Error converting {hpp_file}: {str(e)}")
+                rel_path = os.path.relpath(hpp_file, input_dir)
+                output_path = os.path.join(output_dir, rel_path)
+                
+                os.makedirs(os.path.dirname(output_path), exist_ok=True)
+                
+                with open(output_path, 'w', encoding='utf-8') as f:
+                    f.write(converted)
+                    
+                print(f"Successfully converted ({done}/{len(hpp_files)}) {hpp_file} -> {output_path}")
+                
+            except Exception as e:
+                print(f"Error converting {hpp_file}: {str(e)}")
 
 def main():
-    import sys
-    
     if len(sys.argv) < 3:
         print("Usage: python hpp_converter.py <input_directory> <output_directory>")
         return
@@ -6,6 +6,22 @@ import shutil
 import re
 from pathlib import Path
 
+# Template edits, each file is rewritten in a single pass dispatched on the matched group
+_CMAKE_RE = re.compile(
+    r'(?P<project>(project\s*\(\s*)SampleCppMod(\s*\)))'
+    r'|(?P<output_path>set\(MOD_OUTPUT_PATH\s+"[^"]*"\s+CACHE\s+PATH\s+"[^"]*"\))'
+    r'|(?P<output_ref>\$\{MOD_OUTPUT_PATH\})'
+)
+_DLLMAIN_RE = re.compile(
+    r'(?P<class_decl>class \w+ : public RC::CppUserModBase)'
+    r'|(?P<mod_name>ModName = STR\("\w+"\))'
+    r'|(?P<constructor>\w+\(\) : CppUserModBase\(\))'
+    r'|(?P<destructor>~\w+\(\))'
+    r'|(?P<define>#define MY_AWESOME_MOD_API)'
+    r'|(?P<api>MY_AWESOME_MOD_API)'
+    r'|(?P<return_new>return new \w+\(\);)'
+)
+
 class ModGenerator:
     def __init__(self, mod_name: str, profile_name: str, base_dir: str):
         self.mod_name = mod_name + "Cpp"
@@ -33,18 +49,21 @@ class ModGenerator:
         with open(cmake_path, "r") as f:
             content = f.read()
         
-        # Replace project name while preserving formatting
-        pattern = r'(project\s*\(\s*)SampleCppMod(\s*\))'
-        content = re.sub(pattern, f'\\1{self.mod_name}\\2', content)
+        output_var = f'MOD_OUTPUT_PATH_{self.mod_name.upper()}'
+        new_path = f'set({output_var} "C:/Users/$ENV{{USERNAME}}/AppData/Roaming/r2modmanPlus-local/VotV/profiles/{self.profile_name}/shimloader/mod/{self.mod_name}/dlls" CACHE PATH "Path to mod output directory")'
         
-        # Update the variable definition
-        pattern = r'set\(MOD_OUTPUT_PATH\s+"[^"]*"\s+CACHE\s+PATH\s+"[^"]*"\)'
-        new_path = f'set(MOD_OUTPUT_PATH_{self.mod_name.upper()} "C:/Users/$ENV{{USERNAME}}/AppData/Roaming/r2modmanPlus-local/VotV/profiles/{self.profile_name}/shimloader/mod/{self.mod_name}/dlls" CACHE PATH "Path to mod output directory")'
-        content = re.sub(pattern, new_path, content)
+        def replace(match):
+            kind = match.lastgroup
+            # Replace project name while preserving formatting
+            if kind == 'project':
+                return f'{match.group(2)}{self.mod_name}{match.group(3)}'
+            # Update the variable definition
+            if kind == 'output_path':
+                return new_path
+            # Update references to MOD_OUTPUT_PATH in the copy command
+            return f'${{{output_var}}}'
         
-        # Update references to MOD_OUTPUT_PATH in the copy command
-        pattern = r'\${MOD_OUTPUT_PATH}'
-        content = re.sub(pattern, f'${{MOD_OUTPUT_PATH_{self.mod_name.upper()}}}', content)
+        content = _CMAKE_RE.sub(replace, content)
         
         # Write the modified content with original line endings
         with open(cmake_path, "w", newline='\n') as f:
@@ -60,52 +79,32 @@ class ModGenerator:
         # Create the class name with "Cpp" suffix
         class_name = f"{self.mod_name}Cpp"
         
-        # Replace class name and mod name
-        content = re.sub(
-            r'class \w+ : public RC::CppUserModBase',
-            f'class {class_name} : public RC::CppUserModBase',
-            content
-        )
-        
-        # Replace mod name in STR
-        content = re.sub(
-            r'ModName = STR\("\w+"\)',
-            f'ModName = STR("{self.mod_name}")',
-            content
-        )
-        
-        # Update constructor and destructor
-        content = re.sub(
-            r'\w+\(\) : CppUserModBase\(\)',
-            f'{class_name}() : CppUserModBase()',
-            content
-        )
-        
-        content = re.sub(
-            r'~\w+\(\)',
-            f'~{class_name}()',
-            content
-        )
-        
-        # Update define and return statement
-        content = re.sub(
-            r'#define MY_AWESOME_MOD_API',
-            f'#define {self.mod_name.upper()}_MOD_API',
-            content
-        )
-        
-        content = re.sub(
-            r'MY_AWESOME_MOD_API',
-            f'{self.mod_name.upper()}_MOD_API',
-            content, count=2  # Replace both occurrences in extern "C" block
-        )
-        
-        # Update the return new statement
-        content = re.sub(
-            r'return new \w+\(\);',
-            f'return new {class_name}();',
-            content
-        )
+        api_name = f'{self.mod_name.upper()}_MOD_API'
+        replacements = {
+            # Replace class name and mod name
+            'class_decl': f'class {class_name} : public RC::CppUserModBase',
+            'mod_name': f'ModName = STR("{self.mod_name}")',
+            # Update constructor and destructor
+            'constructor': f'{class_name}() : CppUserModBase()',
+            'destructor': f'~{class_name}()',
+            # Update define and return statement
+            'define': f'#define {api_name}',
+            'return_new': f'return new {class_name}();',
+        }
+        api_replaced = 0
+        
+        def replace(match):
+            nonlocal api_replaced
+            kind = match.lastgroup
+            if kind == 'api':
+                # Replace both occurrences in extern "C" block
+                if api_replaced == 2:
+                    return match.group()
+                api_replaced += 1
+                return api_name
+            return replacements[kind]
+        
+        content = _DLLMAIN_RE.sub(replace, content)
         
         with open(dllmain_path, "w") as f:
             f.write(content)